@@ -3,26 +3,96 @@ from qgis.PyQt.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout,
                                     QLabel, QComboBox, QSpinBox, QGroupBox, QCheckBox,
                                     QTextEdit)
 from qgis.PyQt.QtCore import Qt
-from qgis.core import QgsRasterLayer, QgsProject, QgsMessageLog
+from qgis.core import (QgsRasterLayer, QgsProject, QgsMessageLog, QgsSingleBandGrayRenderer,
+                       QgsContrastEnhancement, QgsRasterMinMaxOrigin)
 from qgis.gui import QgsMessageBar
 import numpy as np
+import io
 import traceback
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from osgeo import osr, gdal
 import os
 
+# Set NETCDF_VIEWER_DEBUG=1 to get informational messages in the QGIS log panel
+DEBUG = os.environ.get("NETCDF_VIEWER_DEBUG") == "1"
+
+# numba is optional and only needed for dtypes GeoTIFF can't store, so it is imported on first use
+_scale_mask_kernel = None
+
+def get_scale_mask():
+    """Return the compiled mask + scale kernel, or None when numba isn't installed."""
+    global _scale_mask_kernel
+    if _scale_mask_kernel is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _scale_mask_kernel = False
+            return None
+        
+        @njit(cache=True, nogil=True)
+        def scale_mask(src, dst, src_fill, fill, scale, offset):
+            """Write src * scale + offset into dst, keeping `fill` wherever src equals `src_fill`."""
+            for i in range(src.shape[0]):
+                for j in range(src.shape[1]):
+                    v = src[i, j]
+                    if v == src_fill:
+                        dst[i, j] = fill
+                    else:
+                        dst[i, j] = v * scale + offset
+        
+        _scale_mask_kernel = scale_mask
+    return _scale_mask_kernel or None
+
+def next_prime(n):
+    """Return the smallest prime >= n."""
+    while n < 2 or any(n % d == 0 for d in range(2, int(n ** 0.5) + 1)):
+        n += 1
+    return n
+
+# Common names for x/y coordinates
+X_COORDS = frozenset({'x', 'lon', 'longitude', 'projection_x_coordinate'})
+Y_COORDS = frozenset({'y', 'lat', 'latitude', 'projection_y_coordinate'})
+
+# Common projection variable names, in lookup order
+PROJECTION_VARIABLES = ['crs', 'transverse_mercator', 'projection', 'lambert_conformal_conic',
+                        'goes_imager_projection', 'polar_stereographic', 'grid_mapping']
+
+# NumPy data types that GeoTIFF bands can store natively
+GDAL_DATA_TYPES = {
+    np.dtype(np.uint8): gdal.GDT_Byte,
+    np.dtype(np.int16): gdal.GDT_Int16,
+    np.dtype(np.uint16): gdal.GDT_UInt16,
+    np.dtype(np.int32): gdal.GDT_Int32,
+    np.dtype(np.uint32): gdal.GDT_UInt32,
+    np.dtype(np.float32): gdal.GDT_Float32,
+    np.dtype(np.float64): gdal.GDT_Float64,
+}
+
 class NetCDFViewerDialog(QDialog):
     def __init__(self, iface, file_path):
         try:
             super().__init__(None)  # Set parent to None to make it a top-level window
-            QgsMessageLog.logMessage(f"Initializing dialog with file: {file_path}", "NetCDF Viewer", level=0)
+            if DEBUG:
+                QgsMessageLog.logMessage(f"Initializing dialog with file: {file_path}", "NetCDF Viewer", level=0)
             self.iface = iface
             self.file_path = file_path
             
             # Load the dataset
-            QgsMessageLog.logMessage("Opening NetCDF dataset...", "NetCDF Viewer", level=0)
+            if DEBUG:
+                QgsMessageLog.logMessage("Opening NetCDF dataset...", "NetCDF Viewer", level=0)
             import netCDF4 as nc
             self.dataset = nc.Dataset(file_path)
-            QgsMessageLog.logMessage("Dataset opened successfully", "NetCDF Viewer", level=0)
+            # Reads return raw arrays; masking and scaling are handled where the data is used
+            self.dataset.set_auto_maskandscale(False)
+            if DEBUG:
+                QgsMessageLog.logMessage("Dataset opened successfully", "NetCDF Viewer", level=0)
+            
+            # Resolve names and the projection variable once; they don't change while the dialog is open
+            self._var_names = list(self.dataset.variables)
+            self._proj_var, self._proj_name = self._find_proj_var()
+            # Projection WKT built on the first GeoTIFF export and reused afterwards
+            self._projection_wkt = None
             
             # Setup UI
             self.setupUi()
@@ -39,7 +109,8 @@ class NetCDFViewerDialog(QDialog):
     def setupUi(self):
         """Set up the user interface."""
         try:
-            QgsMessageLog.logMessage("Setting up UI...", "NetCDF Viewer", level=0)
+            if DEBUG:
+                QgsMessageLog.logMessage("Setting up UI...", "NetCDF Viewer", level=0)
             
             # Main layout
             layout = QVBoxLayout()
@@ -66,12 +137,19 @@ class NetCDFViewerDialog(QDialog):
             self.tree = QTreeWidget()
             self.tree.setHeaderLabels(["Name", "Details"])
             self.tree.setMinimumHeight(200)
+            self.tree.itemExpanded.connect(self.populateTreeBranch)
             var_layout.addWidget(self.tree)
             
             # Combo box for variable selection
             self.var_combo = QComboBox()
+            self.var_combo.currentTextChanged.connect(self.updateDimSelectors)
             var_layout.addWidget(self.var_combo)
             
+            # Index selectors for dimensions beyond the 2-D (y, x) plane
+            self.dim_selectors = {}
+            self.dim_layout = QVBoxLayout()
+            var_layout.addLayout(self.dim_layout)
+            
             # Visualize button
             self.visualize_btn = QPushButton("Visualize")
             self.visualize_btn.clicked.connect(self.visualize)
@@ -83,7 +161,8 @@ class NetCDFViewerDialog(QDialog):
             self.setWindowTitle(f"NetCDF Viewer - {os.path.basename(self.file_path)}")
             self.resize(600, 800)  # Make the window larger
             
-            QgsMessageLog.logMessage("UI setup complete", "NetCDF Viewer", level=0)
+            if DEBUG:
+                QgsMessageLog.logMessage("UI setup complete", "NetCDF Viewer", level=0)
             
         except Exception as e:
             QgsMessageLog.logMessage(f"Error in setupUi: {str(e)}\n{traceback.format_exc()}", "NetCDF Viewer", level=2)
@@ -92,103 +171,160 @@ class NetCDFViewerDialog(QDialog):
     def populateMetadata(self):
         """Populate the metadata text area with NetCDF global and variable attributes."""
         try:
-            metadata = []
+            buf = io.StringIO()
+            w = buf.write
             
             # Global attributes
-            metadata.append("=== Global Attributes ===")
-            for attr in self.dataset.ncattrs():
-                value = getattr(self.dataset, attr)
-                metadata.append(f"{attr}: {value}")
-            metadata.append("")
+            w("=== Global Attributes ===\n")
+            for attr, value in self._dump_attrs(self.dataset).items():
+                w(f"{attr}: {value}\n")
+            w("\n")
             
             # Dimensions
-            metadata.append("=== Dimensions ===")
+            w("=== Dimensions ===\n")
             for dim_name, dim in self.dataset.dimensions.items():
-                metadata.append(f"{dim_name}: {len(dim)}")
-            metadata.append("")
+                w(f"{dim_name}: {len(dim)}\n")
+            w("\n")
             
             # Variables
-            metadata.append("=== Variables ===")
+            w("=== Variables ===\n")
+            var_attrs = {}
             for var_name, var in self.dataset.variables.items():
-                metadata.append(f"\nVariable: {var_name}")
-                metadata.append(f"  Shape: {var.shape}")
-                metadata.append(f"  Dimensions: {var.dimensions}")
-                metadata.append(f"  Type: {var.dtype}")
+                w(f"\nVariable: {var_name}\n"
+                  f"  Shape: {var.shape}\n"
+                  f"  Dimensions: {var.dimensions}\n"
+                  f"  Type: {var.dtype}\n")
                 
                 # Variable attributes
-                if var.ncattrs():
-                    metadata.append("  Attributes:")
-                    for attr in var.ncattrs():
-                        value = getattr(var, attr)
-                        metadata.append(f"    {attr}: {value}")
-            
-            # Special handling for projection info
-            proj_vars = ['crs', 'transverse_mercator', 'projection', 'lambert_conformal_conic',
-                        'goes_imager_projection', 'polar_stereographic', 'grid_mapping']
-            
-            for var_name in proj_vars:
-                if var_name in self.dataset.variables:
-                    metadata.append(f"\n=== Projection Information ({var_name}) ===")
-                    proj_var = self.dataset.variables[var_name]
-                    for attr in proj_var.ncattrs():
-                        value = getattr(proj_var, attr)
-                        metadata.append(f"{attr}: {value}")
+                attrs = var_attrs[var_name] = self._dump_attrs(var)
+                if attrs:
+                    w("  Attributes:\n")
+                    for attr, value in attrs.items():
+                        w(f"    {attr}: {value}\n")
+            
+            # Special handling for projection info, reusing the attributes collected above
+            for var_name in PROJECTION_VARIABLES:
+                if var_name in var_attrs:
+                    w(f"\n=== Projection Information ({var_name}) ===\n")
+                    for attr, value in var_attrs[var_name].items():
+                        w(f"{attr}: {value}\n")
             
             # Set the text
-            self.metadata_text.setPlainText('\n'.join(metadata))
-            QgsMessageLog.logMessage("Metadata populated", "NetCDF Viewer", level=0)
+            self.metadata_text.setPlainText(buf.getvalue())
+            if DEBUG:
+                QgsMessageLog.logMessage("Metadata populated", "NetCDF Viewer", level=0)
             
         except Exception as e:
             QgsMessageLog.logMessage(f"Error in populateMetadata: {str(e)}\n{traceback.format_exc()}", "NetCDF Viewer", level=2)
             raise
 
+    def _dump_attrs(self, obj):
+        """Return all netCDF attributes of a dataset or variable as a dict, with a single ncattrs() call."""
+        return {attr: obj.getncattr(attr) for attr in obj.ncattrs()}
+
     def populateTree(self):
         try:
-            QgsMessageLog.logMessage("Populating tree...", "NetCDF Viewer", level=0)
-            # Add dimensions
-            dim_root = QTreeWidgetItem(self.tree, ["Dimensions"])
-            for dim_name, dim in self.dataset.dimensions.items():
-                QgsMessageLog.logMessage(f"Adding dimension: {dim_name}", "NetCDF Viewer", level=0)
-                item = QTreeWidgetItem(dim_root, [
-                    dim_name,
-                    str(len(dim))
-                ])
-            
-            # Add variables
-            var_root = QTreeWidgetItem(self.tree, ["Variables"])
-            for var_name, var in self.dataset.variables.items():
-                QgsMessageLog.logMessage(f"Adding variable: {var_name}", "NetCDF Viewer", level=0)
-                item = QTreeWidgetItem(var_root, [
-                    var_name,
-                    str(var.shape)
-                ])
-                self.var_combo.addItem(var_name)
-            
-            self.tree.expandAll()
-            QgsMessageLog.logMessage("Tree populated", "NetCDF Viewer", level=0)
+            if DEBUG:
+                QgsMessageLog.logMessage("Populating tree...", "NetCDF Viewer", level=0)
+            # Branches are filled in on first expand (see populateTreeBranch); until then
+            # each root only carries a placeholder child so Qt shows the expand arrow.
+            self.tree.setUpdatesEnabled(False)
+            self.tree.blockSignals(True)
+            try:
+                dim_root = QTreeWidgetItem(self.tree, ["Dimensions"])
+                dim_root.setData(0, Qt.UserRole, "dimensions")
+                QTreeWidgetItem(dim_root)
+                
+                var_root = QTreeWidgetItem(self.tree, ["Variables"])
+                var_root.setData(0, Qt.UserRole, "variables")
+                QTreeWidgetItem(var_root)
+            finally:
+                self.tree.blockSignals(False)
+                self.tree.setUpdatesEnabled(True)
+            
+            self.var_combo.addItems(self._var_names)
+            if DEBUG:
+                QgsMessageLog.logMessage("Tree populated", "NetCDF Viewer", level=0)
         except Exception as e:
             QgsMessageLog.logMessage(f"Error in populateTree: {str(e)}\n{traceback.format_exc()}", "NetCDF Viewer", level=2)
             raise
 
+    def populateTreeBranch(self, item):
+        """Create the children of a lazily populated tree branch the first time it is expanded."""
+        try:
+            branch = item.data(0, Qt.UserRole)
+            if branch is None:
+                return
+            
+            # Freeze repaints and item signals so the whole branch costs a single relayout
+            self.tree.setUpdatesEnabled(False)
+            self.tree.blockSignals(True)
+            try:
+                item.setData(0, Qt.UserRole, None)
+                item.takeChildren()
+                
+                if branch == "dimensions":
+                    children = [QTreeWidgetItem([dim_name, str(len(dim))])
+                                for dim_name, dim in self.dataset.dimensions.items()]
+                else:
+                    children = [QTreeWidgetItem([var_name, str(var.shape)])
+                                for var_name, var in self.dataset.variables.items()]
+                item.addChildren(children)
+            finally:
+                self.tree.blockSignals(False)
+                self.tree.setUpdatesEnabled(True)
+        except Exception as e:
+            QgsMessageLog.logMessage(f"Error in populateTreeBranch: {str(e)}\n{traceback.format_exc()}", "NetCDF Viewer", level=2)
+            raise
+
+    def updateDimSelectors(self, var_name):
+        """Rebuild the index spin boxes for the leading dimensions of the selected variable."""
+        try:
+            # Remove selectors left over from the previous variable
+            while self.dim_layout.count():
+                row = self.dim_layout.takeAt(0).layout()
+                while row.count():
+                    widget = row.takeAt(0).widget()
+                    if widget is not None:
+                        widget.deleteLater()
+                # The row layout is still a child of dim_layout until deleted
+                row.deleteLater()
+            self.dim_selectors = {}
+            
+            if var_name not in self.dataset.variables:
+                return
+            
+            var = self.dataset.variables[var_name]
+            # The last two dimensions form the raster plane; every other one gets an index
+            for dim_name in var.dimensions[:-2]:
+                row = QHBoxLayout()
+                row.addWidget(QLabel(dim_name))
+                spin = QSpinBox()
+                spin.setRange(0, max(len(self.dataset.dimensions[dim_name]) - 1, 0))
+                row.addWidget(spin)
+                self.dim_layout.addLayout(row)
+                self.dim_selectors[dim_name] = spin
+        except Exception as e:
+            QgsMessageLog.logMessage(f"Error in updateDimSelectors: {str(e)}\n{traceback.format_exc()}", "NetCDF Viewer", level=2)
+            raise
+
+    def _find_proj_var(self):
+        """Return the projection variable of the dataset and its name, or (None, None)."""
+        for var_name in PROJECTION_VARIABLES:
+            if var_name in self.dataset.variables:
+                return self.dataset.variables[var_name], var_name
+        return None, None
+
     def get_projection_info(self):
         """Extract projection information from NetCDF file."""
-        # Common projection variable names
-        proj_vars = ['crs', 'transverse_mercator', 'projection', 'lambert_conformal_conic',
-                    'goes_imager_projection', 'polar_stereographic', 'grid_mapping']
-        
-        # Try to find projection variable
-        proj_var = None
-        for var_name in proj_vars:
-            if var_name in self.dataset.variables:
-                proj_var = self.dataset.variables[var_name]
-                break
-        
+        proj_var = self._proj_var
         if proj_var is None:
             return None, None
         
         # Get all projection attributes
-        proj_attrs = {attr: getattr(proj_var, attr) for attr in proj_var.ncattrs()}
-        QgsMessageLog.logMessage(f"Found projection attributes: {proj_attrs}", "NetCDF Viewer", level=0)
+        proj_attrs = self._dump_attrs(proj_var)
+        if DEBUG:
+            QgsMessageLog.logMessage(f"Found projection attributes: {proj_attrs}", "NetCDF Viewer", level=0)
         
         # Try to create projection string based on attributes
         srs = osr.SpatialReference()
@@ -235,93 +371,106 @@ class NetCDFViewerDialog(QDialog):
                     proj_attrs.get('false_northing', 0)
                 )
         
-        # Try to get the variable name safely
-        try:
-            var_name = getattr(proj_var, 'name', None)
-        except:
-            var_name = None
-            
-        return srs, var_name
+        return srs, self._proj_name
+
+    def _edge_coords(self, coord_var, axis):
+        """Read the first, second and last values of a coordinate along the given axis ('x' or 'y').
+        
+        2-D coordinates are read along the first row (x) or first column (y), as three
+        single-element reads instead of loading the whole coordinate array.
+        """
+        if len(coord_var.shape) > 1:
+            if axis == 'x':
+                n = coord_var.shape[1]
+                read = lambda i: coord_var[0, i]
+            else:
+                n = coord_var.shape[0]
+                read = lambda i: coord_var[i, 0]
+        else:
+            n = coord_var.shape[0]
+            read = lambda i: coord_var[i]
+        
+        # Automatic scaling is off for the dataset, so unpack packed coordinates (e.g. GOES x/y) here
+        scale = float(getattr(coord_var, 'scale_factor', 1.0))
+        offset = float(getattr(coord_var, 'add_offset', 0.0))
+        unpack = lambda i: float(read(i)) * scale + offset
+        
+        first = unpack(0)
+        second = unpack(1) if n > 1 else first
+        last = unpack(n - 1)
+        return first, second, last, n
 
     def get_geotransform(self, var):
         """Extract geotransform information from variable coordinates."""
         try:
             # Get dimension names
             dims = var.dimensions
+            variables = self.dataset.variables
             
             # Look for coordinate variables
             x_var = y_var = None
             x_name = y_name = None
             
-            # Common names for x/y coordinates
-            x_coords = ['x', 'lon', 'longitude', 'projection_x_coordinate']
-            y_coords = ['y', 'lat', 'latitude', 'projection_y_coordinate']
-            
-            # Try to get coordinates from variable attributes first
-            if hasattr(var, 'coordinates'):
-                coord_vars = var.coordinates.split()
-                for coord_name in coord_vars:
-                    if coord_name in self.dataset.variables:
-                        coord_var = self.dataset.variables[coord_name]
-                        if coord_name in x_coords or (hasattr(coord_var, 'axis') and getattr(coord_var, 'axis') == 'X'):
-                            x_var = coord_var
-                            x_name = coord_name
-                        elif coord_name in y_coords or (hasattr(coord_var, 'axis') and getattr(coord_var, 'axis') == 'Y'):
-                            y_var = coord_var
-                            y_name = coord_name
-            
-            # If not found in coordinates, try dimensions
-            if x_var is None or y_var is None:
-                for dim in dims:
-                    if dim in self.dataset.variables:
-                        coord_var = self.dataset.variables[dim]
-                        if dim in x_coords or (hasattr(coord_var, 'axis') and getattr(coord_var, 'axis') == 'X'):
-                            x_var = coord_var
-                            x_name = dim
-                        elif dim in y_coords or (hasattr(coord_var, 'axis') and getattr(coord_var, 'axis') == 'Y'):
-                            y_var = coord_var
-                            y_name = dim
+            # Candidates come from the variable's coordinates attribute first, then its dimensions
+            coord_names = var.coordinates.split() if hasattr(var, 'coordinates') else []
+            
+            # Axis attribute of every candidate that is a variable, read in a single pass
+            coord_axis = {name: variables[name].__dict__.get('axis')
+                          for name in (*coord_names, *dims) if name in variables}
+            
+            for candidates in (coord_names, dims):
+                # Dimensions are only consulted if the coordinates attribute didn't give both axes
+                if x_name is not None and y_name is not None:
+                    break
+                for name in candidates:
+                    if name not in coord_axis:
+                        continue
+                    axis = coord_axis[name]
+                    if name in X_COORDS or axis == 'X':
+                        x_name = name
+                    elif name in Y_COORDS or axis == 'Y':
+                        y_name = name
+            
+            if x_name is not None:
+                x_var = variables[x_name]
+            if y_name is not None:
+                y_var = variables[y_name]
             
             if x_var is not None and y_var is not None:
-                x = x_var[:]
-                y = y_var[:]
-                
-                # Handle different array orientations
-                if len(x.shape) > 1:
-                    x = x[0, :]  # Take first row for 2D coordinates
-                if len(y.shape) > 1:
-                    y = y[:, 0]  # Take first column for 2D coordinates
+                # Only the first, second and last coordinate values are needed
+                x0, x1, xn, nx = self._edge_coords(x_var, 'x')
+                y0, y1, yn, ny = self._edge_coords(y_var, 'y')
                 
                 # Check if coordinates are in ascending order
-                x_ascending = x[1] > x[0] if len(x) > 1 else True
-                y_ascending = y[1] > y[0] if len(y) > 1 else True
+                x_ascending = x1 > x0 if nx > 1 else True
+                y_ascending = y1 > y0 if ny > 1 else True
                 
                 # Check if we're dealing with GOES satellite data (coordinates in radians)
                 is_goes = False
-                if 'goes_imager_projection' in self.dataset.variables:
+                if self._proj_name == 'goes_imager_projection':
                     is_goes = True
                     # Get satellite height for scaling
-                    proj_var = self.dataset.variables['goes_imager_projection']
-                    satellite_height = getattr(proj_var, 'perspective_point_height', 35786023.0)  # Default GOES-R height
+                    satellite_height = getattr(self._proj_var, 'perspective_point_height', 35786023.0)  # Default GOES-R height
                     
                     # Convert coordinates from radians to meters
-                    x = x * satellite_height
-                    y = y * satellite_height
-                    QgsMessageLog.logMessage(f"Converting GOES coordinates using satellite height: {satellite_height}m", "NetCDF Viewer", level=0)
+                    x0, x1, xn = x0 * satellite_height, x1 * satellite_height, xn * satellite_height
+                    y0, y1, yn = y0 * satellite_height, y1 * satellite_height, yn * satellite_height
+                    if DEBUG:
+                        QgsMessageLog.logMessage(f"Converting GOES coordinates using satellite height: {satellite_height}m", "NetCDF Viewer", level=0)
                 
                 # Get pixel sizes
-                pixel_width = abs(x[1] - x[0]) if len(x) > 1 else 1
-                pixel_height = abs(y[1] - y[0]) if len(y) > 1 else 1
+                pixel_width = abs(x1 - x0) if nx > 1 else 1
+                pixel_height = abs(y1 - y0) if ny > 1 else 1
                 
                 # Get corners
-                x_min = float(x[0])
+                x_min = x0
                 if not x_ascending:
-                    x_min = float(x[-1])
+                    x_min = xn
                     pixel_width = -pixel_width
                 
-                y_max = float(y[0])  # Use first Y as top edge
+                y_max = y0  # Use first Y as top edge
                 if y_ascending:
-                    y_max = float(y[-1])  # If ascending, use last Y as top edge
+                    y_max = yn  # If ascending, use last Y as top edge
                     pixel_height = -pixel_height  # Negative height for ascending Y
                 
                 # Create geotransform: (top_left_x, pixel_width, x_rotation, top_left_y, y_rotation, pixel_height)
@@ -334,14 +483,15 @@ class NetCDFViewerDialog(QDialog):
                     -pixel_height    # Pixel height (negative for north-up images)
                 ]
                 
-                QgsMessageLog.logMessage(
-                    f"Coordinate details:\n" +
-                    f"X: min={x[0]}, max={x[-1]}, ascending={x_ascending}\n" +
-                    f"Y: min={y[0]}, max={y[-1]}, ascending={y_ascending}\n" +
-                    f"Is GOES: {is_goes}\n" +
-                    f"Geotransform: {geotransform}",
-                    "NetCDF Viewer", level=0
-                )
+                if DEBUG:
+                    QgsMessageLog.logMessage(
+                        f"Coordinate details:\n" +
+                        f"X: min={x0}, max={xn}, ascending={x_ascending}\n" +
+                        f"Y: min={y0}, max={yn}, ascending={y_ascending}\n" +
+                        f"Is GOES: {is_goes}\n" +
+                        f"Geotransform: {geotransform}",
+                        "NetCDF Viewer", level=0
+                    )
                 
                 return geotransform, (x_name, y_name)
             
@@ -350,16 +500,101 @@ class NetCDFViewerDialog(QDialog):
             QgsMessageLog.logMessage(f"Error getting geotransform: {str(e)}", "NetCDF Viewer", level=2)
             return None, None
 
+    def open_netcdf_layer(self, var, slab, layer_name):
+        """Open the selected slab straight from the NetCDF file through GDAL's netCDF driver.
+        
+        Returns None when GDAL cannot open or georeference the variable, in which case
+        the caller falls back to writing a GeoTIFF.
+        """
+        uri = f'NETCDF:"{self.file_path}":{var.name}'
+        if DEBUG:
+            QgsMessageLog.logMessage(f"Opening with GDAL netCDF driver: {uri}", "NetCDF Viewer", level=0)
+        # Ask GDAL itself rather than the layer's CRS, which depends on the user's
+        # unknown-CRS setting (prompt / project CRS) in QGIS
+        try:
+            gdal_ds = gdal.Open(uri)
+        except RuntimeError:
+            gdal_ds = None
+        if (gdal_ds is None or gdal_ds.GetSpatialRef() is None or
+                gdal_ds.GetGeoTransform(can_return_null=True) is None):
+            if DEBUG:
+                QgsMessageLog.logMessage("GDAL could not georeference the variable, converting to GeoTIFF", "NetCDF Viewer", level=0)
+            return None
+        band_count = gdal_ds.RasterCount
+        gdal_ds = None
+        
+        # GDAL exposes every leading-dimension combination as a band, in C order
+        band = 0
+        for index, size in zip(slab[:-2], var.shape[:-2]):
+            band = band * size + index
+        band += 1
+        if band > band_count:
+            return None
+        
+        layer = QgsRasterLayer(uri, layer_name, "gdal")
+        if not layer.isValid():
+            return None
+        
+        # No overviews are built here: that would mean writing an .ovr sidecar next to the
+        # user's NetCDF file, so this path renders from full resolution.
+        # Scale/offset are reported by the driver and applied by the GDAL provider,
+        # so only the band needs picking
+        renderer = QgsSingleBandGrayRenderer(layer.dataProvider(), band)
+        layer.setRenderer(renderer)
+        layer.setContrastEnhancement(QgsContrastEnhancement.StretchToMinimumMaximum,
+                                     QgsRasterMinMaxOrigin.MinMax)
+        return layer
+
+    def open_netcdf3_memmap(self):
+        """Memory-map a CDF-1/CDF-2 file with scipy; returns None for other formats, without scipy or if scipy fails."""
+        # scipy's reader doesn't understand CDF-5 (NETCDF3_64BIT_DATA), so only these two are mapped
+        if self.dataset.file_format not in ('NETCDF3_CLASSIC', 'NETCDF3_64BIT_OFFSET'):
+            return None
+        try:
+            from scipy.io import netcdf_file
+        except ImportError:
+            return None
+        if DEBUG:
+            QgsMessageLog.logMessage(f"Memory-mapping {self.dataset.file_format} file", "NetCDF Viewer", level=0)
+        try:
+            return netcdf_file(self.file_path, 'r', mmap=True)
+        except Exception as e:
+            QgsMessageLog.logMessage(f"Warning: Could not memory-map file, reading with netCDF4: {str(e)}", "NetCDF Viewer", level=1)
+            return None
+
+    def set_chunk_cache(self, var, xsize):
+        """Size the HDF5 chunk cache of a chunked variable to hold two full rows of chunks.
+        
+        The default 1 MiB cache is smaller than a row of typical satellite chunks, so
+        block reads would decompress the same chunks over and over. Returns the previous
+        (size, nelems, preemption) so the caller can restore it, or None if nothing changed.
+        """
+        chunking = var.chunking()
+        if not chunking or chunking == 'contiguous':
+            return None
+        previous_cache = var.get_var_chunk_cache()
+        chunk_bytes = int(np.prod(chunking)) * var.dtype.itemsize
+        chunks_per_row = -(-xsize // chunking[-1])
+        cache_size = 2 * chunk_bytes * chunks_per_row
+        # HDF5 wants a prime number of hash slots, several times the number of cached chunks
+        nelems = next_prime(max(521, 4 * 2 * chunks_per_row))
+        var.set_var_chunk_cache(size=cache_size, nelems=nelems, preemption=0.75)
+        if DEBUG:
+            QgsMessageLog.logMessage(f"Chunk cache set to {cache_size} bytes, {nelems} slots for chunks {chunking}", "NetCDF Viewer", level=0)
+        return previous_cache
+
     def visualize(self):
         try:
-            QgsMessageLog.logMessage("Visualizing...", "NetCDF Viewer", level=0)
+            if DEBUG:
+                QgsMessageLog.logMessage("Visualizing...", "NetCDF Viewer", level=0)
             var_name = self.var_combo.currentText()
             if not var_name:
                 return
                 
             var = self.dataset.variables[var_name]
-            QgsMessageLog.logMessage(f"Selected variable: {var_name}, shape: {var.shape}, dtype: {var.dtype}", "NetCDF Viewer", level=0)
-            QgsMessageLog.logMessage(f"Variable dimensions: {var.dimensions}", "NetCDF Viewer", level=0)
+            if DEBUG:
+                QgsMessageLog.logMessage(f"Selected variable: {var_name}, shape: {var.shape}, dtype: {var.dtype}", "NetCDF Viewer", level=0)
+                QgsMessageLog.logMessage(f"Variable dimensions: {var.dimensions}", "NetCDF Viewer", level=0)
             
             # Check if variable has valid dimensions for a raster
             if len(var.shape) < 2:
@@ -367,24 +602,51 @@ class NetCDFViewerDialog(QDialog):
                     "Error", f"Variable {var_name} must have at least 2 dimensions for visualization", level=2)
                 return
             
+            # Index of the selected 2-D slab; leading dimensions are indexed by the selectors
+            y_axis, x_axis = len(var.dimensions) - 2, len(var.dimensions) - 1
+            slab = [self.dim_selectors[d].value() if d in self.dim_selectors else 0
+                    for d in var.dimensions[:-2]] + [slice(None), slice(None)]
+            if DEBUG:
+                QgsMessageLog.logMessage(f"Selected slab: {tuple(slab)}", "NetCDF Viewer", level=0)
+            layer_name = f"{var_name} from {os.path.basename(self.file_path)}"
+            
+            # Let GDAL's netCDF driver read the variable in place when it can georeference it
+            layer = self.open_netcdf_layer(var, slab, layer_name)
+            if layer is not None:
+                QgsProject.instance().addMapLayer(layer)
+                if DEBUG:
+                    QgsMessageLog.logMessage("Layer added successfully", "NetCDF Viewer", level=0)
+                return
+            
             # Create a temporary file for visualization
             import tempfile
-            import os
-            import numpy as np
             
             # Create temp file with .tif extension (not .tiff)
             temp_handle, temp_tif = tempfile.mkstemp(suffix='.tif')
             os.close(temp_handle)  # Close the file handle
             
-            QgsMessageLog.logMessage(f"Creating temporary file: {temp_tif}", "NetCDF Viewer", level=0)
+            if DEBUG:
+                QgsMessageLog.logMessage(f"Creating temporary file: {temp_tif}", "NetCDF Viewer", level=0)
             
-            # Get data and handle fill values
-            data = var[:]
+            # Automatic scaling is off, so netCDF4 no longer honours _Unsigned="true";
+            # reinterpret such signed integers as the unsigned type of the same size
+            src_dtype = np.dtype(var.dtype)
+            unsigned = (src_dtype.kind == 'i' and
+                        str(getattr(var, '_Unsigned', 'false')).lower() == 'true')
+            if unsigned:
+                src_dtype = np.dtype(src_dtype.str.replace('i', 'u'))
+            
+            # The slab is read block by block below, as raw values; masking and scaling are applied there
             fill_value = None
+            has_fill_value = hasattr(var, '_FillValue') or hasattr(var, 'missing_value')
             if hasattr(var, '_FillValue'):
-                fill_value = float(var._FillValue)  # Convert to float
+                fill_value = var._FillValue
             elif hasattr(var, 'missing_value'):
-                fill_value = float(var.missing_value)  # Convert to float
+                fill_value = var.missing_value
+            if fill_value is not None:
+                if unsigned:
+                    fill_value = np.asarray(fill_value).astype(var.dtype).view(src_dtype)
+                fill_value = float(np.asarray(fill_value).ravel()[0])  # Convert to float
             else:
                 fill_value = -9999.0  # Default float fill value
             
@@ -392,13 +654,29 @@ class NetCDFViewerDialog(QDialog):
             scale_factor = float(getattr(var, 'scale_factor', 1.0))
             add_offset = float(getattr(var, 'add_offset', 0.0))
             
-            # Convert data to float32 for visualization
-            data = data.astype(np.float32)
-            if fill_value is not None:
-                data = np.ma.masked_equal(data, fill_value)
-                # Update fill value for scaled data
-                fill_value = fill_value * scale_factor + add_offset
-            data = data * scale_factor + add_offset
+            # Keep the variable's own data type when GDAL can store it; scale and offset are
+            # then recorded on the band and applied by QGIS at display time
+            out_dtype = src_dtype.newbyteorder('=')
+            gdal_type = GDAL_DATA_TYPES.get(out_dtype)
+            rescale = gdal_type is None
+            
+            # Integer bands can't hold the made-up default (or it may collide with real data),
+            # so they only get a NoData value the variable actually defines
+            if not rescale and out_dtype.kind in 'iu' and not has_fill_value:
+                fill_value = None
+            
+            # Fill value in the raw (unscaled) units, used to find missing pixels in each block
+            raw_fill_value = fill_value
+            scale_mask = None
+            if rescale:
+                scale_mask = get_scale_mask()
+                out_dtype = np.dtype(np.float32)
+                gdal_type = gdal.GDT_Float32
+                if fill_value is not None:
+                    # Update fill value for scaled data
+                    fill_value = fill_value * scale_factor + add_offset
+            if DEBUG:
+                QgsMessageLog.logMessage(f"Output data type: {gdal.GetDataTypeName(gdal_type)}", "NetCDF Viewer", level=0)
             
             # Create output raster
             driver = gdal.GetDriverByName('GTiff')
@@ -406,28 +684,39 @@ class NetCDFViewerDialog(QDialog):
                 raise RuntimeError("Failed to get GTiff driver")
                 
             # Get dimensions
-            xsize = int(data.shape[1])  # Width
-            ysize = int(data.shape[0])  # Height
+            xsize = int(var.shape[x_axis])  # Width
+            ysize = int(var.shape[y_axis])  # Height
             
-            QgsMessageLog.logMessage(f"Creating raster with dimensions: {xsize}x{ysize}", "NetCDF Viewer", level=0)
+            if DEBUG:
+                QgsMessageLog.logMessage(f"Creating raster with dimensions: {xsize}x{ysize}", "NetCDF Viewer", level=0)
             
             # Create with options
-            creation_options = ['COMPRESS=LZW', 'TILED=YES']
-            out_ds = driver.Create(temp_tif, xsize, ysize, 1, gdal.GDT_Float32, creation_options)
+            # NUM_THREADS lets GDAL compress tiles on all cores while the blocks below are scaled in parallel
+            # Horizontal differencing (2) for integers, floating-point predictor (3) for floats
+            predictor = 3 if np.issubdtype(out_dtype, np.floating) else 2
+            creation_options = ['COMPRESS=LZW', f'PREDICTOR={predictor}', 'TILED=YES',
+                                'BLOCKXSIZE=256', 'BLOCKYSIZE=256', 'NUM_THREADS=ALL_CPUS',
+                                'BIGTIFF=IF_SAFER']
+            out_ds = driver.Create(temp_tif, xsize, ysize, 1, gdal_type, creation_options)
             
             if out_ds is None:
                 raise RuntimeError(f"Failed to create output dataset at {temp_tif}")
             
-            # Get projection information
-            srs, grid_mapping = self.get_projection_info()
-            if srs:
-                QgsMessageLog.logMessage(f"Setting projection: {srs.ExportToWkt()}", "NetCDF Viewer", level=0)
-                out_ds.SetProjection(srs.ExportToWkt())
+            # Get projection information; it is the same for every variable, so build it once
+            if self._projection_wkt is None:
+                srs, _ = self.get_projection_info()
+                self._projection_wkt = srs.ExportToWkt() if srs else ''
+            wkt = self._projection_wkt
+            if wkt:
+                if DEBUG:
+                    QgsMessageLog.logMessage(f"Setting projection: {wkt}", "NetCDF Viewer", level=0)
+                out_ds.SetProjection(wkt)
             
             # Get geotransform information
             geotransform, coord_names = self.get_geotransform(var)
             if geotransform:
-                QgsMessageLog.logMessage(f"Setting geotransform: {geotransform}", "NetCDF Viewer", level=0)
+                if DEBUG:
+                    QgsMessageLog.logMessage(f"Setting geotransform: {geotransform}", "NetCDF Viewer", level=0)
                 out_ds.SetGeoTransform(geotransform)
             
             # Write data
@@ -435,39 +724,112 @@ class NetCDFViewerDialog(QDialog):
             if band is None:
                 raise RuntimeError("Failed to get raster band")
                 
-            write_status = band.WriteArray(data)
-            if write_status != 0:
-                raise RuntimeError(f"Failed to write array to band: {write_status}")
+            # Stream the slab block by block, matching the tiles of the output GeoTIFF,
+            # so only a few blocks of data are resident at a time
+            bx, by = band.GetBlockSize()
+            read_lock = threading.Lock()   # netCDF4/HDF5 reads are not reentrant
+            write_lock = threading.Lock()  # a GDAL dataset must not be written from two threads at once
+            
+            def process_block(offsets):
+                yoff, xoff = offsets
+                block_slab = list(slab)
+                block_slab[y_axis] = slice(yoff, min(yoff + by, ysize))
+                block_slab[x_axis] = slice(xoff, min(xoff + bx, xsize))
+                with read_lock:
+                    block = np.asarray(source[tuple(block_slab)])
+                if unsigned:
+                    block = block.view(block.dtype.str.replace('i', 'u'))
+                
+                if rescale and scale_mask is not None:
+                    # Fused mask + scale + offset in a single pass
+                    src = np.asarray(block, dtype=block.dtype.newbyteorder('='))
+                    block = np.empty(src.shape, dtype=np.float32)
+                    scale_mask(src, block, raw_fill_value, fill_value, scale_factor, add_offset)
+                elif rescale:
+                    # Convert data to float32 for visualization (memory-mapped blocks are read-only)
+                    block = block.astype(np.float32, copy=not block.flags.writeable)
+                    # Missing pixels keep the sentinel GDAL is told about via SetNoDataValue
+                    mask = np.equal(block, raw_fill_value) if raw_fill_value is not None else None
+                    np.multiply(block, scale_factor, out=block)
+                    np.add(block, add_offset, out=block)
+                    if mask is not None:
+                        np.putmask(block, mask, fill_value)
+                else:
+                    # Raw values are written as-is, only converted to native byte order
+                    block = np.asarray(block, dtype=out_dtype)
+                
+                with write_lock:
+                    write_status = band.WriteArray(block, xoff, yoff)
+                if write_status != 0:
+                    raise RuntimeError(f"Failed to write array to band: {write_status}")
+            
+            # Classic-format files are memory-mapped so blocks are paged in by the kernel
+            mmap_file = self.open_netcdf3_memmap()
+            source = mmap_file.variables[var_name].data if mmap_file is not None else var
+            previous_cache = self.set_chunk_cache(var, xsize) if mmap_file is None else None
+            
+            block_offsets = [(yoff, xoff) for yoff in range(0, ysize, by) for xoff in range(0, xsize, bx)]
+            try:
+                with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                    list(executor.map(process_block, block_offsets))
+            finally:
+                if mmap_file is not None:
+                    source = None
+                    mmap_file.close()
+                # The variable stays open with the dialog, so give back the enlarged chunk cache
+                if previous_cache is not None:
+                    var.set_var_chunk_cache(*previous_cache)
                 
             if fill_value is not None:
-                QgsMessageLog.logMessage(f"Setting no data value: {fill_value}", "NetCDF Viewer", level=0)
+                if DEBUG:
+                    QgsMessageLog.logMessage(f"Setting no data value: {fill_value}", "NetCDF Viewer", level=0)
                 try:
                     band.SetNoDataValue(float(fill_value))
                 except Exception as e:
                     QgsMessageLog.logMessage(f"Warning: Could not set no data value: {str(e)}", "NetCDF Viewer", level=1)
             
+            if not rescale and (scale_factor != 1.0 or add_offset != 0.0):
+                band.SetScale(scale_factor)
+                band.SetOffset(add_offset)
+            
             # Compute statistics for better visualization
             band.ComputeStatistics(False)
             
+            # Build overviews so zoomed-out repaints don't decimate the full-resolution raster
+            overview_levels = [level for level in (2, 4, 8, 16, 32, 64)
+                               if xsize // level > 0 and ysize // level > 0]
+            if overview_levels:
+                if DEBUG:
+                    QgsMessageLog.logMessage(f"Building overviews: {overview_levels}", "NetCDF Viewer", level=0)
+                # COMPRESS_OVERVIEW is process-wide, so restore the user's value afterwards
+                previous_compression = gdal.GetConfigOption('COMPRESS_OVERVIEW')
+                gdal.SetConfigOption('COMPRESS_OVERVIEW', 'LZW')
+                try:
+                    out_ds.BuildOverviews('AVERAGE', overview_levels)
+                finally:
+                    gdal.SetConfigOption('COMPRESS_OVERVIEW', previous_compression)
+            
             # Close dataset to flush to disk
             band = None
             out_ds = None
             
             # Load as raster layer
-            layer_name = f"{var_name} from {os.path.basename(self.file_path)}"
-            QgsMessageLog.logMessage(f"Creating raster layer: {layer_name}", "NetCDF Viewer", level=0)
+            if DEBUG:
+                QgsMessageLog.logMessage(f"Creating raster layer: {layer_name}", "NetCDF Viewer", level=0)
             
             layer = QgsRasterLayer(temp_tif, layer_name)
             if layer.isValid():
                 QgsProject.instance().addMapLayer(layer)
-                QgsMessageLog.logMessage("Layer added successfully", "NetCDF Viewer", level=0)
+                if DEBUG:
+                    QgsMessageLog.logMessage("Layer added successfully", "NetCDF Viewer", level=0)
             else:
                 error = layer.error().summary()
                 QgsMessageLog.logMessage(f"Layer is invalid. Error: {error}", "NetCDF Viewer", level=2)
                 self.iface.messageBar().pushMessage(
                     "Error", f"Failed to create layer: {error}", level=2)
             
-            QgsMessageLog.logMessage("Visualization complete", "NetCDF Viewer", level=0)
+            if DEBUG:
+                QgsMessageLog.logMessage("Visualization complete", "NetCDF Viewer", level=0)
             
         except Exception as e:
             QgsMessageLog.logMessage(f"Error in visualize: {str(e)}\n{traceback.format_exc()}", "NetCDF Viewer", level=2)